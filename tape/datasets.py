@@ -41,6 +41,13 @@ def pad_sequences(sequences: Sequence, constant_value=0, dtype=None) -> np.ndarr
     if dtype is None:
         dtype = sequences[0].dtype
 
+    if all(seq.shape == sequences[0].shape for seq in sequences):
+        # Nothing to pad, stack directly rather than filling an array and copying into it
+        if isinstance(sequences[0], np.ndarray):
+            return np.stack(sequences).astype(dtype, copy=False)
+        elif isinstance(sequences[0], torch.Tensor):
+            return torch.stack(list(sequences)).to(dtype)
+
     if isinstance(sequences[0], np.ndarray):
         array = np.full(shape, constant_value, dtype=dtype)
     elif isinstance(sequences[0], torch.Tensor):
@@ -53,6 +60,14 @@ def pad_sequences(sequences: Sequence, constant_value=0, dtype=None) -> np.ndarr
     return array
 
 
+def make_input_mask(sequences: Sequence) -> torch.Tensor:
+    """Creates the padded input mask for a batch of sequences directly from their lengths,
+    rather than padding a separate array of ones per example.
+    """
+    lengths = torch.LongTensor([len(seq) for seq in sequences])
+    return (torch.arange(int(lengths.max())) < lengths.unsqueeze(1)).long()
+
+
 class FastaDataset(Dataset):
     """Creates a dataset from a fasta file.
     Args:
@@ -271,14 +286,13 @@ class EmbedDataset(Dataset):
     def __getitem__(self, index: int):
         item = self.data[index]
         token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
-        return item['id'], token_ids, input_mask
+        return item['id'], token_ids
 
     def collate_fn(self, batch: List[Tuple[Any, ...]]) -> Dict[str, torch.Tensor]:
-        ids, tokens, input_mask = zip(*batch)
+        ids, tokens = zip(*batch)
         ids = list(ids)
+        input_mask = make_input_mask(tokens)
         tokens = torch.from_numpy(pad_sequences(tokens))
-        input_mask = torch.from_numpy(pad_sequences(input_mask))
         return {'ids': ids, 'input_ids': tokens, 'input_mask': input_mask}  # type: ignore
 
 
@@ -320,22 +334,16 @@ class MaskedLanguageModelingDataset(Dataset):
         masked_tokens, labels = self._apply_bert_mask(tokens)
         masked_token_ids = np.array(
             self.tokenizer.convert_tokens_to_ids(masked_tokens), np.int64)
-        input_mask = np.ones_like(masked_token_ids)
 
-        masked_token_ids = np.array(
-            self.tokenizer.convert_tokens_to_ids(masked_tokens), np.int64)
-
-        return masked_token_ids, input_mask, labels, item['clan'], item['family']
+        return masked_token_ids, labels, item['clan'], item['family']
 
     def collate_fn(self, batch: List[Any]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, lm_label_ids, clan, family = tuple(zip(*batch))
+        input_ids, lm_label_ids, clan, family = tuple(zip(*batch))
 
+        input_mask = make_input_mask(input_ids)
         input_ids = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
         # ignore_index is -1
         lm_label_ids = torch.from_numpy(pad_sequences(lm_label_ids, -1))
-        clan = torch.LongTensor(clan)  # type: ignore
-        family = torch.LongTensor(family)  # type: ignore
 
         return {'input_ids': input_ids,
                 'input_mask': input_mask,
@@ -405,19 +413,16 @@ class LanguageModelingDataset(Dataset):
     def __getitem__(self, index):
         item = self.data[index]
         token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
 
-        return token_ids, input_mask, item['clan'], item['family']
+        return token_ids, item['clan'], item['family']
 
     def collate_fn(self, batch: List[Any]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, clan, family = tuple(zip(*batch))
+        input_ids, clan, family = tuple(zip(*batch))
 
         torch_inputs = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
+        input_mask = make_input_mask(input_ids)
         # ignore_index is -1
         torch_labels = torch.from_numpy(pad_sequences(input_ids, -1))
-        clan = torch.LongTensor(clan)  # type: ignore
-        family = torch.LongTensor(family)  # type: ignore
 
         return {'input_ids': torch_inputs,
                 'input_mask': input_mask,
@@ -442,21 +447,43 @@ class FluorescenceDataset(Dataset):
 
         data_path = Path(data_path)
         data_file = f'fluorescence/fluorescence_{split}.lmdb'
-        self.data = dataset_factory(data_path / data_file, in_memory)
+        data = dataset_factory(data_path / data_file)
+        self._num_examples = len(data)
+        self._in_memory = in_memory
+
+        if in_memory:
+            # Hold all sequences in one string indexed by offsets and all labels in one
+            # array, rather than caching a dictionary per example.
+            items = [data[i] for i in range(self._num_examples)]
+            self._offsets = np.cumsum([0] + [len(item['primary']) for item in items])
+            self._sequences = ''.join(item['primary'] for item in items)
+            self._labels = np.array(
+                [item['log_fluorescence'][0] for item in items], np.float32)
+        else:
+            self.data = data
 
     def __len__(self) -> int:
-        return len(self.data)
+        return self._num_examples
 
     def __getitem__(self, index: int):
-        item = self.data[index]
-        token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
-        return token_ids, input_mask, float(item['log_fluorescence'][0])
+        if not 0 <= index < self._num_examples:
+            raise IndexError(index)
+
+        if self._in_memory:
+            primary = self._sequences[self._offsets[index]:self._offsets[index + 1]]
+            log_fluorescence = float(self._labels[index])
+        else:
+            item = self.data[index]
+            primary = item['primary']
+            log_fluorescence = float(item['log_fluorescence'][0])
+
+        token_ids = self.tokenizer.encode(primary)
+        return token_ids, log_fluorescence
 
     def collate_fn(self, batch: List[Tuple[Any, ...]]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, fluorescence_true_value = tuple(zip(*batch))
+        input_ids, fluorescence_true_value = tuple(zip(*batch))
+        input_mask = make_input_mask(input_ids)
         input_ids = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
         fluorescence_true_value = torch.FloatTensor(fluorescence_true_value)  # type: ignore
         fluorescence_true_value = fluorescence_true_value.unsqueeze(1)
 
@@ -492,13 +519,12 @@ class StabilityDataset(Dataset):
     def __getitem__(self, index: int):
         item = self.data[index]
         token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
-        return token_ids, input_mask, float(item['stability_score'][0])
+        return token_ids, float(item['stability_score'][0])
 
     def collate_fn(self, batch: List[Tuple[Any, ...]]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, stability_true_value = tuple(zip(*batch))
+        input_ids, stability_true_value = tuple(zip(*batch))
+        input_mask = make_input_mask(input_ids)
         input_ids = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
         stability_true_value = torch.FloatTensor(stability_true_value)  # type: ignore
         stability_true_value = stability_true_value.unsqueeze(1)
 
@@ -535,13 +561,12 @@ class RemoteHomologyDataset(Dataset):
     def __getitem__(self, index: int):
         item = self.data[index]
         token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
-        return token_ids, input_mask, item['fold_label']
+        return token_ids, item['fold_label']
 
     def collate_fn(self, batch: List[Tuple[Any, ...]]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, fold_label = tuple(zip(*batch))
+        input_ids, fold_label = tuple(zip(*batch))
+        input_mask = make_input_mask(input_ids)
         input_ids = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
         fold_label = torch.LongTensor(fold_label)  # type: ignore
 
         return {'input_ids': input_ids,
@@ -577,7 +602,6 @@ class ProteinnetDataset(Dataset):
         item = self.data[index]
         protein_length = len(item['primary'])
         token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
 
         valid_mask = item['valid_mask']
         contact_map = np.less(squareform(pdist(item['tertiary'])), 8.0).astype(np.int64)
@@ -587,12 +611,12 @@ class ProteinnetDataset(Dataset):
         invalid_mask |= np.abs(yind - xind) < 6
         contact_map[invalid_mask] = -1
 
-        return token_ids, input_mask, contact_map, protein_length
+        return token_ids, contact_map, protein_length
 
     def collate_fn(self, batch: List[Tuple[Any, ...]]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, contact_labels, protein_length = tuple(zip(*batch))
+        input_ids, contact_labels, protein_length = tuple(zip(*batch))
+        input_mask = make_input_mask(input_ids)
         input_ids = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
         contact_labels = torch.from_numpy(pad_sequences(contact_labels, -1))
         protein_length = torch.LongTensor(protein_length)  # type: ignore
 
@@ -629,18 +653,17 @@ class SecondaryStructureDataset(Dataset):
     def __getitem__(self, index: int):
         item = self.data[index]
         token_ids = self.tokenizer.encode(item['primary'])
-        input_mask = np.ones_like(token_ids)
 
         # pad with -1s because of cls/sep tokens
         labels = np.asarray(item['ss3'], np.int64)
         labels = np.pad(labels, (1, 1), 'constant', constant_values=-1)
 
-        return token_ids, input_mask, labels
+        return token_ids, labels
 
     def collate_fn(self, batch: List[Tuple[Any, ...]]) -> Dict[str, torch.Tensor]:
-        input_ids, input_mask, ss_label = tuple(zip(*batch))
+        input_ids, ss_label = tuple(zip(*batch))
+        input_mask = make_input_mask(input_ids)
         input_ids = torch.from_numpy(pad_sequences(input_ids, 0))
-        input_mask = torch.from_numpy(pad_sequences(input_mask, 0))
         ss_label = torch.from_numpy(pad_sequences(ss_label, -1))
 
         output = {'input_ids': input_ids,
@@ -752,13 +775,20 @@ class TRRosettaDataset(Dataset):
     def collate_fn(self, batch):
         msa, dist_bins, omega_bins, theta_bins, phi_bins = tuple(zip(*batch))
         # features = pad_sequences([self.featurize(msa_) for msa_ in msa], 0)
-        msa1hot = pad_sequences(
-            [F.one_hot(torch.LongTensor(msa_), 21) for msa_ in msa], 0, torch.float)
+        # Allocate the padded one-hot tensor once and scatter each msa into it, rather
+        # than building an int64 one-hot per example and copying it into the padding.
+        num_alignments = max(msa_.shape[0] for msa_ in msa)
+        seqlen = max(msa_.shape[1] for msa_ in msa)
+        msa1hot = torch.zeros(len(msa), num_alignments, seqlen, 21)
+        for msa1hot_, msa_ in zip(msa1hot, msa):
+            msa_ = torch.as_tensor(msa_, dtype=torch.long)
+            msa1hot_[:msa_.size(0), :msa_.size(1)].scatter_(-1, msa_.unsqueeze(-1), 1)
         # input_mask = torch.FloatTensor(pad_sequences(input_mask, 0))
-        dist_bins = torch.LongTensor(pad_sequences(dist_bins, -1))
-        omega_bins = torch.LongTensor(pad_sequences(omega_bins, 0))
-        theta_bins = torch.LongTensor(pad_sequences(theta_bins, 0))
-        phi_bins = torch.LongTensor(pad_sequences(phi_bins, 0))
+        # np.digitize already returns int64, so these wrap the padded arrays without a copy
+        dist_bins = torch.as_tensor(pad_sequences(dist_bins, -1), dtype=torch.long)
+        omega_bins = torch.as_tensor(pad_sequences(omega_bins, 0), dtype=torch.long)
+        theta_bins = torch.as_tensor(pad_sequences(theta_bins, 0), dtype=torch.long)
+        phi_bins = torch.as_tensor(pad_sequences(phi_bins, 0), dtype=torch.long)
 
         return {'msa1hot': msa1hot,
                 # 'input_mask': input_mask,
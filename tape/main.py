@@ -43,6 +43,19 @@ def create_base_parser() -> argparse.ArgumentParser:
                         default='iupac', help='Tokenizes to use on the amino acid sequences')
     parser.add_argument('--num_workers', default=8, type=int,
                         help='Number of workers to use for multi-threaded data loading')
+    parser.add_argument('--cudnn_benchmark', action='store_true',
+                        help='Let cudnn benchmark and cache the fastest convolution '
+                             'algorithms. Only affects convolutional models (resnet, '
+                             'trrosetta) and convolutional prediction heads, not the '
+                             'transformer or LSTM models. Speeds up tasks whose sequences '
+                             'all have the same length (e.g. fluorescence), but slows down '
+                             'variable lengths.')
+    parser.add_argument('--compile_model', action='store_true',
+                        help='Compile the model forward pass with static shapes using '
+                             'torch.compile (requires torch>=2.0). Ignored for multi-GPU '
+                             'runs without --local_rank, which use DataParallel. Intended '
+                             'for tasks whose sequences all have the same length '
+                             '(e.g. fluorescence), variable lengths recompile per shape.')
     parser.add_argument('--log_level', default=logging.INFO,
                         choices=['DEBUG', 'INFO', 'WARN', 'WARNING', 'ERROR',
                                  logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR],
@@ -131,6 +144,13 @@ def create_embed_parser(base_parser: argparse.ArgumentParser) -> argparse.Argume
                         help='If true, saves an embedding at every amino acid position '
                              'in the sequence. Note that this can take a large amount '
                              'of disk space.')
+    parser.add_argument('--embed_format', choices=['npz', 'mmap'], default='npz',
+                        help="Output format. 'npz' writes a single .npz file, 'mmap' "
+                             "writes a directory of raw arrays that can be loaded "
+                             "with tape.utils.load_memmap without copying into memory.")
+    parser.add_argument('--embed_dtype', choices=['float32', 'float16'], default='float32',
+                        help='Precision to save embeddings in. float16 halves the size of '
+                             'the output file.')
     parser.set_defaults(task='embed')
     return parser
 
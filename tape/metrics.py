@@ -24,9 +24,10 @@ def mean_absolute_error(target: Sequence[float],
 @registry.register_metric('spearmanr')
 def spearmanr(target: Sequence[float],
               prediction: Sequence[float]) -> float:
-    target_array = np.asarray(target)
-    prediction_array = np.asarray(prediction)
-    return scipy.stats.spearmanr(target_array, prediction_array).correlation
+    # Pearson correlation of the (tie-averaged) ranks, without computing a p-value
+    target_ranks = scipy.stats.rankdata(np.ravel(target))
+    prediction_ranks = scipy.stats.rankdata(np.ravel(prediction))
+    return np.corrcoef(target_ranks, prediction_ranks)[0, 1]
 
 
 @registry.register_metric('accuracy')
@@ -23,6 +23,7 @@ import math
 
 import torch
 from torch import nn
+import torch.nn.functional as F
 from torch.utils.checkpoint import checkpoint
 
 from .modeling_utils import ProteinConfig
@@ -176,21 +177,30 @@ class ProteinBertSelfAttention(nn.Module):
         key_layer = self.transpose_for_scores(mixed_key_layer)
         value_layer = self.transpose_for_scores(mixed_value_layer)
 
-        # Take the dot product between "query" and "key" to get the raw attention scores.
-        attention_scores = torch.matmul(query_layer, key_layer.transpose(-1, -2))
-        attention_scores = attention_scores / math.sqrt(self.attention_head_size)
-        # Apply the attention mask is (precomputed for all layers in
-        # ProteinBertModel forward() function)
-        attention_scores = attention_scores + attention_mask
-
-        # Normalize the attention scores to probabilities.
-        attention_probs = nn.Softmax(dim=-1)(attention_scores)
-
-        # This is actually dropping out entire tokens to attend to, which might
-        # seem a bit unusual, but is taken from the original ProteinBert paper.
-        attention_probs = self.dropout(attention_probs)
-
-        context_layer = torch.matmul(attention_probs, value_layer)
+        if hasattr(F, 'scaled_dot_product_attention') and not self.output_attentions:
+            # Same computation as below, but torch>=2.0 can dispatch it to fused
+            # (flash / memory efficient) kernels that never materialize the
+            # attention probabilities.
+            context_layer = F.scaled_dot_product_attention(
+                query_layer, key_layer, value_layer, attn_mask=attention_mask,
+                dropout_p=self.dropout.p if self.training else 0.)
+        else:
+            # Scale the query rather than the (seq_length x seq_length) attention scores,
+            # then take the dot product between "query" and "key" to get the raw scores.
+            query_layer = query_layer / math.sqrt(self.attention_head_size)
+            attention_scores = torch.matmul(query_layer, key_layer.transpose(-1, -2))
+            # Apply the attention mask is (precomputed for all layers in
+            # ProteinBertModel forward() function)
+            attention_scores += attention_mask
+
+            # Normalize the attention scores to probabilities.
+            attention_probs = torch.softmax(attention_scores, -1)
+
+            # This is actually dropping out entire tokens to attend to, which might
+            # seem a bit unusual, but is taken from the original ProteinBert paper.
+            attention_probs = self.dropout(attention_probs)
+
+            context_layer = torch.matmul(attention_probs, value_layer)
 
         context_layer = context_layer.permute(0, 2, 1, 3).contiguous()
         new_context_layer_shape = context_layer.size()[:-2] + (self.all_head_size,)
@@ -788,8 +788,7 @@ class ValuePredictionHead(nn.Module):
         outputs = (value_pred,)
 
         if targets is not None:
-            loss_fct = nn.MSELoss()
-            value_pred_loss = loss_fct(value_pred, targets)
+            value_pred_loss = F.mse_loss(value_pred, targets)
             outputs = (value_pred_loss,) + outputs
         return outputs  # (loss), value_prediction
 
@@ -832,9 +831,8 @@ class SequenceToSequenceClassificationHead(nn.Module):
             loss_fct = nn.CrossEntropyLoss(ignore_index=self._ignore_index)
             classification_loss = loss_fct(
                 sequence_logits.view(-1, self.num_labels), targets.view(-1))
-            acc_fct = Accuracy(ignore_index=self._ignore_index)
-            metrics = {'accuracy':
-                       acc_fct(sequence_logits.view(-1, self.num_labels), targets.view(-1))}
+            metrics = {'accuracy': accuracy(sequence_logits.view(-1, self.num_labels),
+                                            targets.view(-1), self._ignore_index)}
             loss_and_metrics = (classification_loss, metrics)
             outputs = (loss_and_metrics,) + outputs
         return outputs  # (loss), sequence_logits
@@ -108,6 +108,12 @@ class TAPETokenizer():
         self._vocab_type = vocab
         assert self.start_token in self.vocab and self.stop_token in self.vocab
 
+        # Lookup table from byte value to id for single character tokens, -1 if unknown
+        self._byte_to_id = np.full(256, -1, np.int64)
+        for token, index in self.vocab.items():
+            if len(token) == 1 and ord(token) < 256:
+                self._byte_to_id[ord(token)] = index
+
     @property
     def vocab_size(self) -> int:
         return len(self.vocab)
@@ -164,6 +170,22 @@ class TAPETokenizer():
         return cls_token + token_ids + sep_token
 
     def encode(self, text: str) -> np.ndarray:
+        try:
+            byte_array = np.frombuffer(text.encode('ascii'), np.uint8)
+        except UnicodeEncodeError:
+            byte_array = None
+
+        if byte_array is not None:
+            # Vectorized path, equivalent to the token-by-token conversion below
+            ids = self._byte_to_id[byte_array]
+            if (ids >= 0).all():
+                encoded = np.empty(len(ids) + 2, np.int64)
+                encoded[0] = self.vocab[self.start_token]
+                encoded[1:-1] = ids
+                encoded[-1] = self.vocab[self.stop_token]
+                return encoded
+
+        # Fall back to the slow path, which raises on unrecognized tokens
         tokens = self.tokenize(text)
         tokens = self.add_special_tokens(tokens)
         token_ids = self.convert_tokens_to_ids(tokens)
@@ -58,6 +58,20 @@ class ForwardRunner:
         self._forward_arg_keys = forward_arg_keys
         assert 'input_ids' in self._forward_arg_keys
 
+    def compile_model(self):
+        # Compiles the forward pass in place, so the module (and its state dict keys) is
+        # unchanged for saving. Static shapes suit tasks whose sequences all have the same
+        # length (e.g. fluorescence), variable lengths trigger a recompile per new shape.
+        if not hasattr(torch, 'compile'):
+            logger.warning("torch.compile requires torch>=2.0, running the model uncompiled")
+        elif self.local_rank == -1 and self.n_gpu > 1:
+            # DataParallel replicas copy the module __dict__, so they would all call the
+            # compiled forward bound to the original module and its cuda:0 parameters
+            logger.warning("torch.compile is not supported with DataParallel, "
+                           "running the model uncompiled")
+        else:
+            self.model.forward = torch.compile(self.model.forward, dynamic=False)
+
     def initialize_distributed_model(self):
         if self.local_rank != -1:
             if not self.fp16:
@@ -372,13 +386,14 @@ def run_eval_epoch(eval_loader: DataLoader,
 
     save_outputs = []
 
-    for batch in tqdm(eval_loader, desc='Evaluation', total=len(eval_loader),
-                      disable=not is_master):
-        loss, metrics, outputs = runner.forward(batch, return_outputs=True)  # type: ignore
-        predictions = outputs[1].cpu().numpy()
-        targets = batch['targets'].cpu().numpy()
-        for pred, target in zip(predictions, targets):
-            save_outputs.append({'prediction': pred, 'target': target})
+    with utils.inference_mode():
+        for batch in tqdm(eval_loader, desc='Evaluation', total=len(eval_loader),
+                          disable=not is_master):
+            loss, metrics, outputs = runner.forward(batch, return_outputs=True)  # type: ignore
+            predictions = outputs[1].cpu().numpy()
+            targets = batch['targets'].cpu().numpy()
+            for pred, target in zip(predictions, targets):
+                save_outputs.append({'prediction': pred, 'target': target})
 
     return save_outputs
 
@@ -407,6 +422,8 @@ def run_train(model_type: str,
               local_rank: int = -1,
               tokenizer: str = 'iupac',
               num_workers: int = 8,
+              cudnn_benchmark: bool = False,
+              compile_model: bool = False,
               debug: bool = False,
               log_level: typing.Union[str, int] = logging.INFO,
               patience: int = -1,
@@ -414,6 +431,8 @@ def run_train(model_type: str,
 
     # SETUP AND LOGGING CODE #
     input_args = locals()
+    if cudnn_benchmark:
+        torch.backends.cudnn.benchmark = True
     device, n_gpu, is_master = utils.setup_distributed(
         local_rank, no_cuda)
 
@@ -434,10 +453,10 @@ def run_train(model_type: str,
     valid_dataset = utils.setup_dataset(task, data_dir, 'valid', tokenizer)
     train_loader = utils.setup_loader(
         train_dataset, batch_size, local_rank, n_gpu,
-        gradient_accumulation_steps, num_workers)
+        gradient_accumulation_steps, num_workers, device, persistent=True)
     valid_loader = utils.setup_loader(
         valid_dataset, batch_size, local_rank, n_gpu,
-        gradient_accumulation_steps, num_workers)
+        gradient_accumulation_steps, num_workers, device)
 
     num_train_optimization_steps = utils.get_num_train_optimization_steps(
         train_dataset, batch_size, num_train_epochs)
@@ -466,6 +485,8 @@ def run_train(model_type: str,
         start_epoch = runner.resume_from_checkpoint(from_pretrained)
     else:
         start_epoch = 0
+    if compile_model:
+        runner.compile_model()
     runner.initialize_distributed_model()
 
     num_train_optimization_steps = utils.get_num_train_optimization_steps(
@@ -550,11 +571,15 @@ def run_eval(model_type: str,
              seed: int = 42,
              tokenizer: str = 'iupac',
              num_workers: int = 8,
+             cudnn_benchmark: bool = False,
+             compile_model: bool = False,
              debug: bool = False,
              metrics: typing.Tuple[str, ...] = (),
              log_level: typing.Union[str, int] = logging.INFO) -> typing.Dict[str, float]:
 
     local_rank = -1  # TAPE does not support torch.distributed.launch for evaluation
+    if cudnn_benchmark:
+        torch.backends.cudnn.benchmark = True
     device, n_gpu, is_master = utils.setup_distributed(local_rank, no_cuda)
     utils.setup_logging(local_rank, save_path=None, log_level=log_level)
     utils.set_random_seeds(seed, n_gpu)
@@ -569,11 +594,13 @@ def run_eval(model_type: str,
     model = model.to(device)
 
     runner = ForwardRunner(model, device, n_gpu)
+    if compile_model:
+        runner.compile_model()
     runner.initialize_distributed_model()
     valid_dataset = utils.setup_dataset(task, data_dir, split, tokenizer)
     valid_loader = utils.setup_loader(
         valid_dataset, batch_size, local_rank, n_gpu,
-        1, num_workers)
+        1, num_workers, device)
 
     metric_functions = [registry.get_metric(name) for name in metrics]
     save_outputs = run_eval_epoch(valid_loader, runner, is_master)
@@ -597,13 +624,28 @@ def run_embed(model_type: str,
               batch_size: int = 1024,
               model_config_file: typing.Optional[str] = None,
               full_sequence_embed: bool = False,
+              embed_format: str = 'npz',
+              embed_dtype: str = 'float32',
               no_cuda: bool = False,
               seed: int = 42,
               tokenizer: str = 'iupac',
               num_workers: int = 8,
+              cudnn_benchmark: bool = False,
+              compile_model: bool = False,
               log_level: typing.Union[str, int] = logging.INFO) -> None:
 
+    # Validate before loading anything so a bad option never leaves a partial output behind
+    if embed_format not in ('npz', 'mmap'):
+        raise ValueError(f"Unrecognized embed_format: {embed_format}. "
+                         f"Must be one of ['npz', 'mmap']")
+    if embed_dtype not in ('float32', 'float16'):
+        raise ValueError(f"Unrecognized embed_dtype: {embed_dtype}. "
+                         f"Must be one of ['float32', 'float16']")
+    save_dtype = getattr(torch, embed_dtype)
+
     local_rank = -1  # TAPE does not support torch.distributed.launch for embedding
+    if cudnn_benchmark:
+        torch.backends.cudnn.benchmark = True
     device, n_gpu, is_master = utils.setup_distributed(local_rank, no_cuda)
     utils.setup_logging(local_rank, save_path=None, log_level=log_level)
     utils.set_random_seeds(seed, n_gpu)
@@ -617,33 +659,48 @@ def run_embed(model_type: str,
         model_type, task_spec.name, model_config_file, from_pretrained)
     model = model.to(device)
     runner = ForwardRunner(model, device, n_gpu)
+    if compile_model:
+        runner.compile_model()
     runner.initialize_distributed_model()
     runner.eval()
     torch.set_grad_enabled(False)
 
     dataset = task_spec.dataset(data_file, tokenizer=tokenizer)  # type: ignore
-    valid_loader = utils.setup_loader(dataset, batch_size, local_rank, n_gpu, 1, num_workers)
+    valid_loader = utils.setup_loader(
+        dataset, batch_size, local_rank, n_gpu, 1, num_workers, device)
 
-    with utils.IncrementalNPZ(out_file) as npzfile:
+    embed_writer: typing.Union[utils.IncrementalNPZ, utils.IncrementalMemmap]
+    if embed_format == 'npz':
+        embed_writer = utils.IncrementalNPZ(out_file)
+    else:
+        embed_writer = utils.IncrementalMemmap(out_file)
+
+    with embed_writer, utils.inference_mode():
         with utils.wrap_cuda_oom_error(local_rank, batch_size, n_gpu):
             for batch in tqdm(valid_loader, total=len(valid_loader)):
                 outputs = runner.forward(batch, no_loss=True)
                 ids = batch['ids']
                 sequence_embed = outputs[0]
-                pooled_embed = outputs[1]
-                sequence_lengths = batch['input_mask'].sum(1)
-                sequence_embed = sequence_embed.cpu().numpy()
-                pooled_embed = pooled_embed.cpu().numpy()
-                sequence_lengths = sequence_lengths.cpu().numpy()
-
-                for seqembed, poolembed, length, protein_id in zip(
-                        sequence_embed, pooled_embed, sequence_lengths, ids):
-                    seqembed = seqembed[:length]
-                    arrays = {'pooled': poolembed}
+                pooled_embed = outputs[1].to(save_dtype).cpu().numpy()
+                sequence_lengths = batch['input_mask'].sum(1).numpy()
+
+                if not full_sequence_embed:
+                    # avgpool across the sequence on the device, so only the averages
+                    # are copied back rather than the embedding at every position
+                    mask = batch['input_mask'].to(sequence_embed)
+                    # (B, 1, L) x (B, L, H) -> (B, H), avoids a masked (B, L, H) temporary
+                    avg_embed = torch.bmm(mask.unsqueeze(1), sequence_embed).squeeze(1)
+                    avg_embed /= mask.sum(1, keepdim=True)
+                    avg_embed = avg_embed.to(save_dtype).cpu().numpy()
+                else:
+                    sequence_embed = sequence_embed.to(save_dtype).cpu().numpy()
+
+                to_save = {}
+                for i, (length, protein_id) in enumerate(zip(sequence_lengths, ids)):
+                    arrays = {'pooled': pooled_embed[i]}
                     if not full_sequence_embed:
-                        # avgpool across the sequence
-                        arrays['avg'] = seqembed.mean(0)
+                        arrays['avg'] = avg_embed[i]
                     else:
-                        arrays['seq'] = seqembed
-                    to_save = {protein_id: arrays}
-                    npzfile.savez(**to_save)
+                        arrays['seq'] = sequence_embed[i, :length]
+                    to_save[protein_id] = arrays
+                embed_writer.savez(**to_save)
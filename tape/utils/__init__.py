@@ -9,8 +9,11 @@ from .utils import get_num_train_optimization_steps  # noqa: F401
 from .utils import set_random_seeds  # noqa: F401
 from .utils import MetricsAccumulator  # noqa: F401
 from .utils import wrap_cuda_oom_error  # noqa: F401
+from .utils import inference_mode  # noqa: F401
 from .utils import write_lmdb  # noqa: F401
 from .utils import IncrementalNPZ  # noqa: F401
+from .utils import IncrementalMemmap  # noqa: F401
+from .utils import load_memmap  # noqa: F401
 
 from .setup_utils import setup_logging  # noqa: F401
 from .setup_utils import setup_optimizer  # noqa: F401
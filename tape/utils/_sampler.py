@@ -6,6 +6,7 @@ See https://github.com/PetrochukM/PyTorch-NLP/
 import typing
 import math
 import operator
+import numpy as np
 from torch.utils.data.sampler import Sampler
 from torch.utils.data.sampler import BatchSampler
 from torch.utils.data.sampler import SubsetRandomSampler
@@ -59,7 +60,9 @@ class BucketBatchSampler(BatchSampler):
         batch_size (int): Size of mini-batch.
         drop_last (bool): If `True` the sampler will drop the last batch if its size
             would be less than `batch_size`.
-        sort_key (callable, optional): Callable to specify a comparison key for sorting.
+        sort_key (callable, optional): Callable to specify a non-negative integer key for
+            sorting, e.g. the sequence length. Must be deterministic for a given index,
+            since keys are cached after the first time they are computed.
         bucket_size_multiplier (int, optional): Buckets are of size
             `batch_size * bucket_size_multiplier`.
     Example:
@@ -83,12 +86,25 @@ class BucketBatchSampler(BatchSampler):
         self.dataset = dataset
         self.bucket_sampler = BatchSampler(
             sampler, min(batch_size * bucket_size_multiplier, len(sampler)), False)
+        # Sort keys are computed once and reused every epoch rather than loading and
+        # featurizing each example again just to sort it. This assumes sort_key is
+        # deterministic per index, datasets that randomly crop or subsample examples in
+        # __getitem__ (e.g. trRosetta training) get their first epoch's lengths frozen.
+        # Keys are integer lengths, -1 marks an index that has not been computed yet.
+        self._sort_key_cache = np.full(len(dataset), -1, np.int32)
+
+    def _get_sort_key(self, index: int) -> int:
+        key = self._sort_key_cache[index]
+        if key < 0:
+            key = self.sort_key(self.dataset[index])
+            self._sort_key_cache[index] = key
+        return int(key)
 
     def __iter__(self):
         for bucket in self.bucket_sampler:
-            sorted_sampler = SortedSampler(self.dataset, self.sort_key, indices=bucket)
+            sorted_bucket = sorted(bucket, key=self._get_sort_key)
             for batch in SubsetRandomSampler(
-                    list(BatchSampler(sorted_sampler, self.batch_size, self.drop_last))):
+                    list(BatchSampler(sorted_bucket, self.batch_size, self.drop_last))):
                 yield batch
 
     def __len__(self):
@@ -2,6 +2,7 @@
 """
 import typing
 import logging
+import inspect
 from pathlib import Path
 import sys
 
@@ -99,7 +100,9 @@ def setup_loader(dataset: Dataset,
                  local_rank: int,
                  n_gpu: int,
                  gradient_accumulation_steps: int,
-                 num_workers: int) -> DataLoader:
+                 num_workers: int,
+                 device: typing.Optional[torch.device] = None,
+                 persistent: bool = False) -> DataLoader:
     sampler = DistributedSampler(dataset) if local_rank != -1 else RandomSampler(dataset)
     batch_size = get_effective_batch_size(
         batch_size, local_rank, n_gpu, gradient_accumulation_steps) * n_gpu
@@ -107,11 +110,21 @@ def setup_loader(dataset: Dataset,
     batch_sampler = BucketBatchSampler(
         sampler, batch_size, False, lambda x: len(x[0]), dataset)
 
+    loader_kwargs: typing.Dict[str, typing.Any] = {}
+    if persistent and num_workers > 0 \
+            and 'persistent_workers' in inspect.signature(DataLoader).parameters:
+        # Keep workers (and their open datasets) alive across epochs, requires torch>=1.7
+        loader_kwargs['persistent_workers'] = True
+
     loader = DataLoader(
         dataset,
         num_workers=num_workers,
         collate_fn=dataset.collate_fn,  # type: ignore
-        batch_sampler=batch_sampler)
+        batch_sampler=batch_sampler,
+        # Pinned batches let the non_blocking copies in ForwardRunner overlap with compute,
+        # only worth it when batches are actually copied to the GPU
+        pin_memory=device is not None and device.type == 'cuda',
+        **loader_kwargs)
 
     return loader
 
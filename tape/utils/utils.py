@@ -6,6 +6,7 @@ from time import strftime, gmtime
 from datetime import datetime
 import os
 import argparse
+import json
 import contextlib
 from collections import defaultdict
 
@@ -245,6 +246,13 @@ class wrap_cuda_oom_error(contextlib.ContextDecorator):
         return False
 
 
+def inference_mode():
+    """Returns torch.inference_mode() if available (torch>=1.9), otherwise torch.no_grad().
+    On top of disabling autograd, inference mode skips view and version counter tracking.
+    """
+    return getattr(torch, 'inference_mode', torch.no_grad)()
+
+
 def write_lmdb(filename: str, iterable: typing.Iterable, map_size: int = 2 ** 20):
     """Utility for writing a dataset to an LMDB file.
 
@@ -268,9 +276,7 @@ def write_lmdb(filename: str, iterable: typing.Iterable, map_size: int = 2 ** 20
 class IncrementalNPZ(object):
     # Modified npz that allows incremental saving, from https://stackoverflow.com/questions/22712292/how-to-use-numpy-savez-in-a-loop-for-save-more-than-one-array  # noqa: E501
     def __init__(self, file):
-        import tempfile
         import zipfile
-        import os
 
         if isinstance(file, str):
             if not file.endswith('.npz'):
@@ -280,11 +286,6 @@ class IncrementalNPZ(object):
 
         zipfile = self.zipfile_factory(file, mode="w", compression=compression)
 
-        # Stage arrays in a temporary file on disk, before writing to zip.
-        fd, tmpfile = tempfile.mkstemp(suffix='-numpy.npy')
-        os.close(fd)
-
-        self.tmpfile = tmpfile
         self.zip = zipfile
         self._i = 0
 
@@ -296,7 +297,6 @@ class IncrementalNPZ(object):
         return zipfile.ZipFile(*args, **kwargs)
 
     def savez(self, *args, **kwds):
-        import os
         import numpy.lib.format as fmt
 
         namedict = kwds
@@ -307,15 +307,12 @@ class IncrementalNPZ(object):
             namedict[key] = val
             self._i += 1
 
-        try:
-            for key, val in namedict.items():
-                fname = key + '.npy'
-                fid = open(self.tmpfile, 'wb')
-                with open(self.tmpfile, 'wb') as fid:
-                    fmt.write_array(fid, np.asanyarray(val), allow_pickle=True)
-                self.zip.write(self.tmpfile, arcname=fname)
-        finally:
-            os.remove(self.tmpfile)
+        for key, val in namedict.items():
+            fname = key + '.npy'
+            # Write straight into the zip entry, rather than staging the array in a
+            # temporary file on disk and then copying that into the archive.
+            with self.zip.open(fname, 'w', force_zip64=True) as fid:
+                fmt.write_array(fid, np.asanyarray(val), allow_pickle=True)
 
     def close(self):
         self.zip.close()
@@ -325,3 +322,76 @@ class IncrementalNPZ(object):
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.close()
+
+
+class IncrementalMemmap(object):
+    """Incrementally saves arrays contiguously into a single raw binary file, alongside a
+    json index of their offsets, shapes and dtypes. Unlike IncrementalNPZ nothing is
+    pickled, so the saved arrays can be memory-mapped with `load_memmap` instead of being
+    read into memory.
+
+    Args:
+        directory (Union[str, Path]): Output directory to write to. Created if needed.
+    """
+
+    def __init__(self, directory: typing.Union[str, Path]):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self._file = (directory / 'arrays.bin').open('wb')
+        self._offset = 0
+        self._index: typing.Dict[str, typing.Dict[str, typing.Dict[str, typing.Any]]] = {}
+
+    def savez(self, **kwds):
+        # Matches the IncrementalNPZ API, values are dictionaries of named arrays
+        for key, arrays in kwds.items():
+            entry = {}
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                array.tofile(self._file)
+                entry[name] = {'offset': self._offset,
+                               'shape': list(array.shape),
+                               'dtype': array.dtype.str}
+                self._offset += array.nbytes
+            self._index[key] = entry
+
+    def close(self):
+        self._file.close()
+        with (self.directory / 'index.json').open('w') as f:
+            json.dump(self._index, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_memmap(directory: typing.Union[str, Path]) \
+        -> typing.Dict[str, typing.Dict[str, np.ndarray]]:
+    """Loads arrays written by IncrementalMemmap as views into a single read-only
+    memory map.
+
+    Args:
+        directory (Union[str, Path]): Directory written to by IncrementalMemmap.
+
+    Returns:
+        arrays (Dict[str, Dict[str, np.ndarray]]): Mapping from key to named arrays.
+    """
+    directory = Path(directory)
+    with (directory / 'index.json').open() as f:
+        index = json.load(f)
+
+    if not index:
+        return {}
+
+    buffer = np.memmap(str(directory / 'arrays.bin'), dtype=np.uint8, mode='r')
+
+    def get_array(spec: typing.Dict[str, typing.Any]) -> np.ndarray:
+        dtype = np.dtype(spec['dtype'])
+        nbytes = int(np.prod(spec['shape'])) * dtype.itemsize
+        array = buffer[spec['offset']:spec['offset'] + nbytes]
+        return array.view(dtype).reshape(spec['shape'])
+
+    return {key: {name: get_array(spec) for name, spec in entry.items()}
+            for key, entry in index.items()}
@@ -0,0 +1,29 @@
+def test_attention_paths_match():
+    import torch
+    from tape import ProteinBertModel, ProteinBertConfig, TAPETokenizer  # type: ignore
+
+    config = ProteinBertConfig(hidden_size=12, intermediate_size=12 * 4, num_hidden_layers=2)
+    model = ProteinBertModel(config).eval()
+    attn_config = ProteinBertConfig(
+        hidden_size=12, intermediate_size=12 * 4, num_hidden_layers=2, output_attentions=True)
+    attn_model = ProteinBertModel(attn_config).eval()
+    attn_model.load_state_dict(model.state_dict())
+    tokenizer = TAPETokenizer(vocab='iupac')
+
+    # Pad the shorter sequence so the additive attention mask is exercised
+    sequences = ['GCTVEDRCLIGMGAILLNGCVIGSGSLVAAGALITQ', 'MKTAYIAKQRQISFV']
+    encoded = [tokenizer.encode(sequence) for sequence in sequences]
+    max_len = max(len(ids) for ids in encoded)
+    token_ids = torch.zeros(len(encoded), max_len, dtype=torch.long)
+    input_mask = torch.zeros(len(encoded), max_len, dtype=torch.long)
+    for i, ids in enumerate(encoded):
+        token_ids[i, :len(ids)] = torch.from_numpy(ids)
+        input_mask[i, :len(ids)] = 1
+
+    with torch.no_grad():
+        output = model(token_ids, input_mask)
+        attn_output = attn_model(token_ids, input_mask)
+
+    assert len(attn_output) == len(output) + 1
+    assert torch.allclose(output[0], attn_output[0], atol=1e-5)
+    assert torch.allclose(output[1], attn_output[1], atol=1e-5)
@@ -0,0 +1,28 @@
+import pytest
+
+
+def test_compile_model():
+    import torch
+    from tape import ProteinBertModel, ProteinBertConfig, TAPETokenizer  # type: ignore
+    from tape.training import ForwardRunner  # type: ignore
+
+    if not hasattr(torch, 'compile'):
+        pytest.skip('torch.compile requires torch>=2.0')
+
+    config = ProteinBertConfig(hidden_size=12, intermediate_size=12 * 4, num_hidden_layers=2)
+    model = ProteinBertModel(config).eval()
+    tokenizer = TAPETokenizer(vocab='iupac')
+
+    sequence = 'GCTVEDRCLIGMGAILLNGCVIGSGSLVAAGALITQ'
+    token_ids = torch.tensor([tokenizer.encode(sequence)])
+    with torch.no_grad():
+        expected = model(token_ids)[0]
+
+    keys = list(model.state_dict().keys())
+    runner = ForwardRunner(model, torch.device('cpu'), n_gpu=0)
+    runner.compile_model()
+    assert list(runner.model.state_dict().keys()) == keys
+
+    with torch.no_grad():
+        output = runner.forward({'input_ids': token_ids}, no_loss=True)[0]
+    assert torch.allclose(output, expected, atol=1e-5)
@@ -0,0 +1,54 @@
+def test_make_input_mask():
+    import numpy as np
+    import torch
+    from tape.datasets import make_input_mask, pad_sequences  # type: ignore
+
+    for lengths in [(5, 3, 7), (4, 4, 4), (1,)]:
+        tokens = [np.random.randint(0, 25, size=length).astype(np.int64) for length in lengths]
+        expected = torch.from_numpy(pad_sequences([np.ones_like(t) for t in tokens], 0))
+        input_mask = make_input_mask(tokens)
+        assert input_mask.dtype == torch.int64
+        assert torch.equal(input_mask, expected)
+
+
+def _pad_sequences_reference(sequences, constant_value=0, dtype=None):
+    # pad_sequences without the uniform-shape fast path
+    import numpy as np
+    import torch
+
+    shape = [len(sequences)] + np.max([seq.shape for seq in sequences], 0).tolist()
+    if dtype is None:
+        dtype = sequences[0].dtype
+    if isinstance(sequences[0], np.ndarray):
+        array = np.full(shape, constant_value, dtype=dtype)
+    elif isinstance(sequences[0], torch.Tensor):
+        array = torch.full(shape, constant_value, dtype=dtype)
+    for arr, seq in zip(array, sequences):
+        arr[tuple(slice(dim) for dim in seq.shape)] = seq
+    return array
+
+
+def test_pad_sequences():
+    import numpy as np
+    import torch
+    from tape.datasets import pad_sequences  # type: ignore
+
+    batches = {
+        'uniform_1d': [np.random.randn(6) for _ in range(3)],
+        'ragged_1d': [np.random.randn(length) for length in (6, 2, 4)],
+        'uniform_2d': [np.random.randn(5, 5) for _ in range(3)],
+        'ragged_2d': [np.random.randn(length, length) for length in (5, 3, 4)],
+    }
+
+    for name, batch in batches.items():
+        for np_dtype, torch_dtype in [(None, None), (np.float32, torch.float32)]:
+            expected = _pad_sequences_reference(batch, -1, np_dtype)
+            padded = pad_sequences(batch, -1, np_dtype)
+            assert padded.dtype == expected.dtype, name
+            np.testing.assert_array_equal(padded, expected)
+
+            tensors = [torch.from_numpy(seq) for seq in batch]
+            expected = _pad_sequences_reference(tensors, -1, torch_dtype)
+            padded = pad_sequences(tensors, -1, torch_dtype)
+            assert padded.dtype == expected.dtype, name
+            assert torch.equal(padded, expected), name
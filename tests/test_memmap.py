@@ -0,0 +1,34 @@
+def test_memmap_roundtrip(tmp_path):
+    import numpy as np
+    from tape.utils import IncrementalMemmap, load_memmap
+
+    arrays = {
+        'seq1': {'pooled': np.arange(4, dtype=np.float32),
+                 'seq': np.random.randn(3, 4).astype(np.float32)},
+        'seq2': {'pooled': np.arange(4, dtype=np.float16),
+                 'seq': np.random.randn(5, 4).astype(np.float16)},
+        'seq3': {'scalar': np.array(7, dtype=np.int64),
+                 'empty': np.zeros((0, 4), dtype=np.float32)},
+    }
+
+    with IncrementalMemmap(tmp_path / 'embed') as writer:
+        writer.savez(seq1=arrays['seq1'])
+        writer.savez(**{key: arrays[key] for key in ('seq2', 'seq3')})
+
+    loaded = load_memmap(tmp_path / 'embed')
+    assert set(loaded.keys()) == set(arrays.keys())
+    for key, entry in arrays.items():
+        assert set(loaded[key].keys()) == set(entry.keys())
+        for name, array in entry.items():
+            assert loaded[key][name].dtype == array.dtype
+            assert loaded[key][name].shape == array.shape
+            np.testing.assert_array_equal(loaded[key][name], array)
+
+
+def test_memmap_empty(tmp_path):
+    from tape.utils import IncrementalMemmap, load_memmap
+
+    with IncrementalMemmap(tmp_path / 'embed'):
+        pass
+
+    assert load_memmap(tmp_path / 'embed') == {}
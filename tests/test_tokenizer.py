@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.mark.parametrize('vocab', ['iupac', 'unirep'])
+def test_encode_matches_token_conversion(vocab):
+    import numpy as np
+    from tape import TAPETokenizer  # type: ignore
+
+    tokenizer = TAPETokenizer(vocab=vocab)
+    for sequence in ['', 'A', 'MKTAYIAKQRQISFVKSHFSRQ', 'BXZUO', 'ACDEFGHIKLMNPQRSTVWY']:
+        expected = tokenizer.convert_tokens_to_ids(
+            tokenizer.add_special_tokens(tokenizer.tokenize(sequence)))
+        encoded = tokenizer.encode(sequence)
+        assert encoded.dtype == np.int64
+        np.testing.assert_array_equal(encoded, np.array(expected, np.int64))
+
+
+@pytest.mark.parametrize('vocab', ['iupac', 'unirep'])
+@pytest.mark.parametrize('sequence', ['mktay', 'MKTé', 'MK<cls>'])
+def test_encode_unrecognized_token(vocab, sequence):
+    from tape import TAPETokenizer  # type: ignore
+
+    tokenizer = TAPETokenizer(vocab=vocab)
+    with pytest.raises(KeyError):
+        tokenizer.convert_tokens_to_ids(tokenizer.tokenize(sequence))
+    with pytest.raises(KeyError):
+        tokenizer.encode(sequence)